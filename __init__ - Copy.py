@@ -5,26 +5,38 @@ Graceful imports with fallback support
 """
 
 from __future__ import annotations
-from typing import List, Dict
+from typing import Iterator, List, Dict, Tuple
 
 # DXF Parser
 try:
-    from . dxf_parser import load_dxf
+    from . dxf_parser import DxfPath, load_dxf, iter_dxf_paths
     _HAS_DXF = True
 except Exception:
     _HAS_DXF = False
-    def load_dxf(filename: str, units: str = "mm") -> List[Dict]:
+    DxfPath = None  # type: ignore
+
+    def load_dxf(filename: str, units: str = "mm", tol_factor: float = 1.0) -> List[Dict]:
         """Fallback when ezdxf not installed"""
         return []
 
+    def iter_dxf_paths(filename: str, units: str = "mm", tol_factor: float = 1.0) -> Iterator[Dict]:
+        """Fallback when ezdxf not installed"""
+        return iter(())
+
 # SVG Parser
 try:
-    from .svg_parser import load_svg
+    from .svg_parser import SvgPath, load_svg, to_tuple_list
     _HAS_SVG = True
 except Exception:
     _HAS_SVG = False
+    SvgPath = None  # type: ignore
+
     def load_svg(filepath: str) -> List[Dict]:
         """Fallback when svgpathtools not installed"""
         return []
 
-__all__ = ["load_dxf", "load_svg"]
\ No newline at end of file
+    def to_tuple_list(points) -> List[Tuple[float, float]]:
+        """Fallback when svgpathtools not installed"""
+        return [(float(p[0]), float(p[1])) for p in points]
+
+__all__ = ["load_dxf", "iter_dxf_paths", "DxfPath", "load_svg", "SvgPath", "to_tuple_list"]
\ No newline at end of file
@@ -2,6 +2,6 @@
 # This file makes plasma_core a real Python package
 
 # Re-export the parser functions so main.py can do: from plasma_core.parsers import load_dxf, load_svg
-from .parsers import load_dxf, load_svg
+from .parsers import load_dxf, iter_dxf_paths, load_svg
 
-__all__ = ["load_dxf", "load_svg"]
\ No newline at end of file
+__all__ = ["load_dxf", "iter_dxf_paths", "load_svg"]
\ No newline at end of file
@@ -0,0 +1,115 @@
+# plasma_core/parsers/_svg_numba.py
+"""
+Numba kernels for the SVG parser.
+
+Importing this module raises ImportError when numba is missing; svg_parser
+checks for that and falls back to uniform NumPy sampling.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numba import njit
+
+# Subdivision depth cap: 2**24 pieces per segment is far past any tolerance
+_MAX_DEPTH = 24
+
+
+@njit(cache=True, nogil=True)
+def _flatness(p0x, p0y, p1x, p1y, p2x, p2y, p3x, p3y):
+    """Largest distance of the two control points from the p0–p3 chord."""
+    dx = p3x - p0x
+    dy = p3y - p0y
+    norm = math.sqrt(dx * dx + dy * dy)
+    if norm == 0.0:
+        d1 = math.sqrt((p1x - p0x) ** 2 + (p1y - p0y) ** 2)
+        d2 = math.sqrt((p2x - p0x) ** 2 + (p2y - p0y) ** 2)
+    else:
+        d1 = abs(dx * (p1y - p0y) - dy * (p1x - p0x)) / norm
+        d2 = abs(dx * (p2y - p0y) - dy * (p2x - p0x)) / norm
+    return max(d1, d2)
+
+
+@njit(cache=True, nogil=True)
+def flatten_cubic(p0x, p0y, p1x, p1y, p2x, p2y, p3x, p3y, tol, out_x, out_y, n_out):
+    """
+    Append a flattened cubic Bezier to out_x/out_y starting at index n_out.
+
+    Midpoint (de Casteljau) subdivision until the control polygon is within
+    tol of the chord. The start point is not written; the caller already
+    has it from the previous segment. Returns the new count, or -1 if the
+    buffers are too small (caller grows them and calls again).
+    """
+    cap = out_x.shape[0]
+    stack = np.empty((_MAX_DEPTH + 2, 8), dtype=np.float64)
+    depth = np.empty(_MAX_DEPTH + 2, dtype=np.int64)
+    stack[0, 0] = p0x
+    stack[0, 1] = p0y
+    stack[0, 2] = p1x
+    stack[0, 3] = p1y
+    stack[0, 4] = p2x
+    stack[0, 5] = p2y
+    stack[0, 6] = p3x
+    stack[0, 7] = p3y
+    depth[0] = 0
+    top = 1
+    while top > 0:
+        top -= 1
+        ax, ay = stack[top, 0], stack[top, 1]
+        bx, by = stack[top, 2], stack[top, 3]
+        cx, cy = stack[top, 4], stack[top, 5]
+        dx, dy = stack[top, 6], stack[top, 7]
+        lvl = depth[top]
+        if lvl >= _MAX_DEPTH or _flatness(ax, ay, bx, by, cx, cy, dx, dy) <= tol:
+            if n_out >= cap:
+                return -1
+            out_x[n_out] = dx
+            out_y[n_out] = dy
+            n_out += 1
+            continue
+        # de Casteljau split at t = 0.5
+        abx, aby = (ax + bx) * 0.5, (ay + by) * 0.5
+        bcx, bcy = (bx + cx) * 0.5, (by + cy) * 0.5
+        cdx, cdy = (cx + dx) * 0.5, (cy + dy) * 0.5
+        abcx, abcy = (abx + bcx) * 0.5, (aby + bcy) * 0.5
+        bcdx, bcdy = (bcx + cdx) * 0.5, (bcy + cdy) * 0.5
+        mx, my = (abcx + bcdx) * 0.5, (abcy + bcdy) * 0.5
+        # Right half first so the left half is popped (and emitted) first
+        stack[top, 0] = mx
+        stack[top, 1] = my
+        stack[top, 2] = bcdx
+        stack[top, 3] = bcdy
+        stack[top, 4] = cdx
+        stack[top, 5] = cdy
+        stack[top, 6] = dx
+        stack[top, 7] = dy
+        depth[top] = lvl + 1
+        stack[top + 1, 0] = ax
+        stack[top + 1, 1] = ay
+        stack[top + 1, 2] = abx
+        stack[top + 1, 3] = aby
+        stack[top + 1, 4] = abcx
+        stack[top + 1, 5] = abcy
+        stack[top + 1, 6] = mx
+        stack[top + 1, 7] = my
+        depth[top + 1] = lvl + 1
+        top += 2
+    return n_out
+
+
+@njit(cache=True, nogil=True)
+def flatten_cubics(ctrl, tol, out_x, out_y):
+    """
+    Flatten every row of ctrl (p0x p0y p1x p1y p2x p2y p3x p3y) into out_x/out_y.
+
+    Returns the point count, or -1 if the buffers are too small.
+    """
+    n = 0
+    for s in range(ctrl.shape[0]):
+        c = ctrl[s]
+        n = flatten_cubic(c[0], c[1], c[2], c[3], c[4], c[5], c[6], c[7], tol, out_x, out_y, n)
+        if n < 0:
+            return -1
+    return n
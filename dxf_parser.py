@@ -2,178 +2,398 @@
 # Fixed: one path per entity – Nov 2025
 from __future__ import annotations
 
+import itertools
 import math
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Dict, Optional, Tuple
+
+import numpy as np
 
 try:
     import ezdxf
+    from ezdxf.path import make_path
     _HAS_EZDXF = True
 except ImportError:
     ezdxf = None  # type: ignore
+    make_path = None  # type: ignore
     _HAS_EZDXF = False
 
+try:
+    from ezdxf.addons import iterdxf
+    _HAS_ITERDXF = True
+except ImportError:
+    iterdxf = None  # type: ignore
+    _HAS_ITERDXF = False
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    njit = None  # type: ignore
+    _HAS_NUMBA = False
+
+# Entity types we know how to flatten
+_DXF_TYPES = ("LINE", "ARC", "CIRCLE", "ELLIPSE", "LWPOLYLINE", "POLYLINE", "SPLINE")
+
+# Squared distance (drawing units^2) under which two flattened points count as the same
+_CLOSE_EPS2 = 1e-18
+
+
+@dataclass(slots=True, frozen=True)
+class DxfPath:
+    """One flattened DXF entity; points are an (N, 2) float64 array in mm."""
+
+    points: np.ndarray
+    closed: bool
+    layer: str
+    color: Optional[str]
+    source: str
+    bbox: Tuple[float, float, float, float]
+
+    def __getitem__(self, key: str) -> Any:
+        """Dict-style access for callers still written against the old dict output."""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly dict (points as nested lists)."""
+        return {
+            "points": self.points.tolist(),
+            "closed": self.closed,
+            "layer": self.layer,
+            "color": self.color,
+            "source": self.source,
+            "bbox": list(self.bbox),
+        }
+
 
 def _unit_scale_to_mm(units: str) -> float:
     if not units:
-        return 1. 0
+        return 1.0
     u = units.strip().lower()
-    if u. startswith("in"):
+    if u.startswith("in"):
         return 25.4
     return 1.0
 
 
-def _flatten_entity(entity, tol: float) -> List[Tuple[float, float]]:
-    pts: List[Tuple[float, float]] = []
-    
-    # Try flattening first
+def _curve_radius(entity, t: str) -> float:
+    """Characteristic radius of a curved entity in drawing units (0.0 if not a curve)."""
     try:
-        for x, y, *_ in entity. flattening(tol):
-            pts.append((float(x), float(y)))
-        if pts:
-            return pts
+        if t in ("ARC", "CIRCLE"):
+            return float(entity.dxf.radius)
+        if t == "ELLIPSE":
+            return float(entity.dxf.major_axis.magnitude)
+        if t == "SPLINE":
+            cp = np.asarray([(p[0], p[1]) for p in entity.control_points], dtype=np.float64)
+            if len(cp):
+                return 0.5 * float(np.ptp(cp, axis=0).max())
     except Exception:
-        pts = []
+        pass
+    return 0.0
 
-    # Fallback to entity-specific handling
-    try:
-        t = entity. dxftype()
-    except Exception:
-        return []
 
-    try:
-        if t == "LINE":
-            s, e = entity. dxf.start, entity.dxf.end
-            return [(float(s.x), float(s.y)), (float(e. x), float(e.y))]
-        
-        if t == "ARC":
-            c, r = entity.dxf.center, float(entity.dxf.radius)
-            a1, a2 = float(entity.dxf.start_angle), float(entity.dxf.end_angle)
-            if a2 < a1:
-                a2 += 360
-            sw = a2 - a1
-            n = max(12, int(sw / max(tol, 1e-4)))
-            out = []
-            for i in range(n + 1):
-                ang = math.radians(a1 + sw * i / n)
-                out.append((c. x + r * math.cos(ang), c.y + r * math.sin(ang)))
-            return [(float(x), float(y)) for x, y in out]
-        
-        if t == "CIRCLE":
-            c, r = entity. dxf.center, float(entity.dxf.radius)
-            n = 64
-            out = []
-            for i in range(n + 1):
-                ang = 2 * math.pi * i / n
-                out.append((c.x + r * math. cos(ang), c.y + r * math.sin(ang)))
-            return [(float(x), float(y)) for x, y in out]
-        
-        if t == "ELLIPSE":
-            tool = entity.construction_tool()
-            n = 64
-            out = [(pt[0], pt[1]) for pt in tool.approximate(n)]
-            return [(float(x), float(y)) for x, y in out]
-        
-        if t == "SPLINE":
-            tool = entity. construction_tool()
-            n = 128
-            out = []
-            for i in range(n + 1):
-                try:
-                    pt = tool.evaluate(i / n)
-                except Exception:
-                    continue
-                out.append((pt[0], pt[1]))
-            if out:
-                return [(float(x), float(y)) for x, y in out]
-            # Fallback to control points
-            cp = []
-            try:
-                for p in entity.control_points:
-                    cp. append((float(p[0]), float(p[1])))
-            except Exception:
-                pass
-            return cp
-        
-        if t in ("LWPOLYLINE", "POLYLINE"):
+def _segments_for(radius: float, sweep: float, tol: float) -> int:
+    """Chord count that keeps the sagitta of an arc of `radius` below `tol`."""
+    if radius <= tol:
+        return 12
+    step = 2.0 * math.acos(1.0 - tol / radius)
+    return max(12, int(math.ceil(abs(sweep) / step)))
+
+
+# ----------------------------------------------------------------------
+# Numba kernels (compiled on first use when numba is installed)
+# ----------------------------------------------------------------------
+def _sample_arc_kernel(cx, cy, r, a1_rad, sw_rad, out):
+    """Write out.shape[0] evenly spaced arc points into the preallocated (N, 2) out."""
+    last = out.shape[0] - 1
+    for i in range(out.shape[0]):
+        a = a1_rad + sw_rad * (i / last)
+        out[i, 0] = cx + r * math.cos(a)
+        out[i, 1] = cy + r * math.sin(a)
+
+
+def _rdp_keep_kernel(arr, tol):
+    """Ramer–Douglas–Peucker keep-mask using an explicit index stack."""
+    n = arr.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = True
+    keep[n - 1] = True
+    stack = np.empty((n, 2), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = n - 1
+    top = 1
+    while top > 0:
+        top -= 1
+        i = stack[top, 0]
+        j = stack[top, 1]
+        if j - i < 2:
+            continue
+        dx = arr[j, 0] - arr[i, 0]
+        dy = arr[j, 1] - arr[i, 1]
+        norm = math.sqrt(dx * dx + dy * dy)
+        dmax = -1.0
+        kmax = i
+        for k in range(i + 1, j):
+            px = arr[k, 0] - arr[i, 0]
+            py = arr[k, 1] - arr[i, 1]
+            if norm == 0.0:
+                d = math.sqrt(px * px + py * py)
+            else:
+                d = abs(dx * py - dy * px) / norm
+            if d > dmax:
+                dmax = d
+                kmax = k
+        if dmax > tol:
+            keep[kmax] = True
+            stack[top, 0] = i
+            stack[top, 1] = kmax
+            stack[top + 1, 0] = kmax
+            stack[top + 1, 1] = j
+            top += 2
+    return keep
+
+
+if _HAS_NUMBA:
+    _sample_arc = njit(cache=True, fastmath=True)(_sample_arc_kernel)
+    _rdp_keep = njit(cache=True)(_rdp_keep_kernel)
+
+
+def _sample_arc_points(cx: float, cy: float, r: float, a1_rad: float, sw_rad: float, n: int) -> np.ndarray:
+    """n + 1 points along an arc; compiled loop when numba is available, NumPy otherwise."""
+    if _HAS_NUMBA:
+        out = np.empty((n + 1, 2), dtype=np.float64)
+        _sample_arc(cx, cy, r, a1_rad, sw_rad, out)
+        return out
+    angs = a1_rad + sw_rad * np.arange(n + 1) / n
+    return np.column_stack((cx + r * np.cos(angs), cy + r * np.sin(angs)))
+
+
+def _rdp_simplify(arr: np.ndarray, tol: float) -> np.ndarray:
+    """Ramer–Douglas–Peucker: drop vertices closer than tol to the simplified polyline."""
+    n = len(arr)
+    if n < 3:
+        return arr
+    if _HAS_NUMBA:
+        return arr[_rdp_keep(np.ascontiguousarray(arr), float(tol))]
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        seg = arr[i + 1:j]
+        dx, dy = arr[j] - arr[i]
+        norm = math.hypot(dx, dy)
+        if norm == 0.0:
+            dist = np.hypot(seg[:, 0] - arr[i, 0], seg[:, 1] - arr[i, 1])
+        else:
+            dist = np.abs(dx * (seg[:, 1] - arr[i, 1]) - dy * (seg[:, 0] - arr[i, 0])) / norm
+        k = int(np.argmax(dist))
+        if dist[k] > tol:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return arr[keep]
+
+
+def _points(seq) -> np.ndarray:
+    """Sink an iterable of (x, y[, ...]) straight into an (N, 2) float64 array."""
+    flat = itertools.chain.from_iterable((p[0], p[1]) for p in seq)
+    return np.fromiter(flat, dtype=np.float64).reshape(-1, 2)
+
+
+def _flatten_line(entity, tol: float) -> np.ndarray:
+    s, e = entity. dxf.start, entity.dxf.end
+    return np.array([(s.x, s.y), (e.x, e.y)], dtype=np.float64)
+
+
+def _flatten_arc(entity, tol: float) -> np.ndarray:
+    c, r = entity.dxf.center, float(entity.dxf.radius)
+    a1, a2 = float(entity.dxf.start_angle), float(entity.dxf.end_angle)
+    if a2 < a1:
+        a2 += 360
+    sw = a2 - a1
+    n = _segments_for(r, math.radians(sw), tol)
+    return _sample_arc_points(c.x, c.y, r, math.radians(a1), math.radians(sw), n)
+
+
+def _flatten_circle(entity, tol: float) -> np.ndarray:
+    c, r = entity.dxf.center, float(entity.dxf.radius)
+    n = _segments_for(r, 2 * math.pi, tol)
+    return _sample_arc_points(c.x, c.y, r, 0.0, 2 * math.pi, n)
+
+
+def _flatten_ellipse(entity, tol: float) -> np.ndarray:
+    tool = entity.construction_tool()
+    n = _segments_for(_curve_radius(entity, "ELLIPSE"), 2 * math.pi, tol)
+    return _points(tool.vertices(tool.params(n + 1)))
+
+
+def _flatten_spline(entity, tol: float) -> np.ndarray:
+    tool = entity.construction_tool()
+    n = _segments_for(_curve_radius(entity, "SPLINE"), 2 * math.pi, tol)
+    out = []
+    if hasattr(tool, "points"):
+        # BSpline evaluates the whole parameter grid in one call
+        ts = np.linspace(0.0, getattr(tool, "max_t", 1.0), n + 1)
+        try:
+            out = list(tool.points(ts.tolist()))
+        except Exception:
             out = []
+    else:
+        for i in range(n + 1):
             try:
-                for x, y, *_ in entity.flattening(tol):
-                    out.append((x, y))
+                out.append(tool.evaluate(i / n))
             except Exception:
-                pass
-            if out:
-                return [(float(x), float(y)) for x, y in out]
-            # Fallback to vertices
-            try:
-                for v in entity:
-                    try:
-                        loc = v.dxf.location
-                        out.append((loc.x, loc.y))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            return [(float(x), float(y)) for x, y in out]
+                continue
+    if out:
+        return _points(out)
+    # Fallback to control points
+    return _points(entity.control_points)
+
+
+def _flatten_polyline(entity, tol: float) -> np.ndarray:
+    # Polylines have no flattening() of their own; the path adapter turns
+    # bulges into arcs and includes the closing segment
+    return _points(make_path(entity).flattening(tol))
+
+
+# dxftype() -> own flattener; first choice for _KERNEL_TYPES, otherwise used
+# when entity.flattening() is unavailable
+_HANDLERS = {
+    "LINE": _flatten_line,
+    "ARC": _flatten_arc,
+    "CIRCLE": _flatten_circle,
+    "ELLIPSE": _flatten_ellipse,
+    "SPLINE": _flatten_spline,
+    "LWPOLYLINE": _flatten_polyline,
+    "POLYLINE": _flatten_polyline,
+}
+
+_CLOSED_BY_TYPE = frozenset({"CIRCLE", "ELLIPSE"})
+_POLY_TYPES = frozenset({"LWPOLYLINE", "POLYLINE"})
+_KERNEL_TYPES = frozenset({"ARC", "CIRCLE"})
+
+
+def _flatten_entity(entity, tol: float, t: str) -> np.ndarray:
+    """Flatten a DXF entity of type t to an (N, 2) float64 array in drawing units."""
+    # Arcs and circles go straight to the sampling kernel
+    if t in _KERNEL_TYPES:
+        try:
+            return _HANDLERS[t](entity, tol)
+        except Exception:
+            pass
+
+    # Try flattening first
+    try:
+        pts = _points(entity.flattening(tol))
+        if len(pts):
+            return pts
     except Exception:
-        return []
+        pass
 
-    return []
+    # Fallback to entity-specific handling
+    handler = _HANDLERS.get(t)
+    if handler is not None:
+        try:
+            return handler(entity, tol)
+        except Exception:
+            pass
+    return np.empty((0, 2), dtype=np.float64)
 
 
-def load_dxf(filename: str, units: str = "mm") -> List[Dict]:
-    if not _HAS_EZDXF or ezdxf is None:
-        return []
+def _is_closed(entity, t: str, ends_meet: bool) -> bool:
+    # Circles and ellipses are always closed
+    if t in _CLOSED_BY_TYPE:
+        return True
+    try:
+        # Check polyline closed flag
+        if t in _POLY_TYPES:
+            return bool(entity.dxf.flags & 1)  # Bit 0 = closed flag
+        # Splines can be closed
+        if t == "SPLINE":
+            return bool(entity.closed)
+    except Exception:
+        pass
+    # For other entities (or unreadable flags), check geometry
+    return ends_meet
 
-    paths: List[Dict] = []
 
-    scale = _unit_scale_to_mm(units)
-    tol = 0.25 / scale
+def _iter_modelspace(filename: str) -> Iterator:
+    """
+    Stream modelspace entities without building the whole document.
+
+    iterdxf keeps memory at O(entity) instead of O(file); files it rejects
+    before the first entity fall back to a full ezdxf.readfile load. Errors
+    after that are raised to the caller.
+    """
+    if _HAS_ITERDXF and iterdxf is not None:
+        try:
+            it = iter(iterdxf.modelspace(filename, types=_DXF_TYPES))
+            first = next(it, None)
+        except Exception:
+            it = None
+        if it is not None:
+            if first is not None:
+                yield first
+            # Past the first entity a read error propagates: a partly streamed
+            # drawing must not pass for a complete one
+            yield from it
+            return
 
     try:
         doc = ezdxf.readfile(filename)
         msp = doc.modelspace()
     except Exception:
-        return []
+        return
+    yield from msp.query(" ".join(_DXF_TYPES))
+
+
+def iter_dxf_paths(filename: str, units: str = "mm", tol_factor: float = 1.0) -> Iterator[DxfPath]:
+    """
+    Yield one DxfPath per modelspace entity (mm) as soon as it is flattened.
+
+    tol_factor scales every flattening tolerance, so a caller that knows the
+    current zoom can re-flatten coarser (> 1) or finer (< 1).
+    """
+    if not _HAS_EZDXF or ezdxf is None:
+        return
 
-    for e in msp:
+    scale = _unit_scale_to_mm(units)
+    tol = 0.25 / scale * tol_factor
+    min_curve_tol = 0.05 / scale * tol_factor
+
+    for e in _iter_modelspace(filename):
         try:
             t = e.dxftype()
         except Exception:
             continue
 
-        pts = _flatten_entity(e, tol)
+        # Curves get a tolerance proportional to their size so small arcs are
+        # not over-sampled and large ones stay smooth
+        radius = _curve_radius(e, t)
+        is_curve = radius > 0.0
+        tol_e = max(min_curve_tol, radius * 1e-3 * tol_factor) if is_curve else tol
+
+        # Dense curves are simplified after flattening, so each stage gets half
+        # the budget: chord error + RDP error stays within tol_e
+        pts = _flatten_entity(e, 0.5 * tol_e if is_curve else tol_e, t)
         if len(pts) < 2:
             continue
 
-        # Determine if closed based on entity type and geometry
-        closed = False
-
-        # Circles and ellipses are always closed
-        if t in ("CIRCLE", "ELLIPSE"):
-            closed = True
-            # Ensure last point equals first for closed shapes
-            if pts[0] != pts[-1]:
-                pts.append(pts[0])
-        # Check polyline closed flag
-        elif t in ("LWPOLYLINE", "POLYLINE"):
-            try:
-                closed = bool(e.dxf.flags & 1)  # Bit 0 = closed flag
-            except Exception:
-                # Fallback: check if first and last points are the same
-                closed = (pts[0] == pts[-1])
-            if closed and pts[0] != pts[-1]:
-                pts.append(pts[0])
-        # Splines can be closed
-        elif t == "SPLINE":
-            try:
-                closed = bool(e.closed)
-            except Exception:
-                closed = (pts[0] == pts[-1])
-            if closed and pts[0] != pts[-1]:
-                pts.append(pts[0])
-        # For other entities, check geometry
-        else:
-            closed = (pts[0] == pts[-1])
+        # Closure lives in the flag alone: a closing point that repeats the
+        # start is dropped and the renderer closes the outline itself
+        dx, dy = pts[0] - pts[-1]
+        ends_meet = bool(dx * dx + dy * dy <= _CLOSE_EPS2)
+        closed = _is_closed(e, t, ends_meet)
+        if closed and ends_meet:
+            pts = pts[:-1]
+            if len(pts) < 2:
+                continue
 
         try:
             layer = str(e.dxf.layer)
@@ -186,20 +406,26 @@ def load_dxf(filename: str, units: str = "mm") -> List[Dict]:
         except Exception:
             color = None
 
-        scaled_pts = [(x * scale, y * scale) for x, y in pts]
+        # Polyline vertices are the drawing's own geometry and are never thinned
+        if is_curve and len(pts) > 256:
+            pts = _rdp_simplify(pts, 0.5 * tol_e)
+        pts *= scale  # in place, no extra pass or allocation
+        (xmin, ymin), (xmax, ymax) = pts.min(axis=0), pts.max(axis=0)
 
         # Each entity becomes one separate path
-        paths.append(
-            {
-                "points": [(float(x), float(y)) for x, y in scaled_pts],
-                "closed": closed,
-                "layer": layer,
-                "color": color,
-                "source": "dxf",
-            }
+        yield DxfPath(
+            points=pts,
+            closed=closed,
+            layer=layer,
+            color=color,
+            source="dxf",
+            bbox=(float(xmin), float(ymin), float(xmax), float(ymax)),
         )
 
-    return paths
+
+def load_dxf(filename: str, units: str = "mm", tol_factor: float = 1.0) -> List[DxfPath]:
+    """Load a DXF file and return one DxfPath per modelspace entity (mm)."""
+    return list(iter_dxf_paths(filename, units, tol_factor))
 
 
 if __name__ == "__main__":
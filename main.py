@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Union
 
-from PyQt6.QtCore import Qt, QPointF, QTimer
-from PyQt6.QtGui import QPainter, QPen, QFont, QRadialGradient, QColor, QBrush
+import numpy as np
+from PyQt6.QtCore import Qt, QObject, QPointF, QRect, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QPen, QFont, QRadialGradient, QColor, QBrush, QPolygonF, QPixmap, QStaticText, QPalette
 from PyQt6. QtWidgets import (
     QApplication,
     QMainWindow,
@@ -38,13 +39,171 @@ except Exception:
     get_translator = None  # type: ignore
 
 try:
-    from plasma_core.parsers import load_dxf, load_svg
+    from plasma_core.parsers import DxfPath, SvgPath, load_dxf, iter_dxf_paths, load_svg
     _HAS_PARSERS = True
 except Exception:
+    DxfPath = None  # type: ignore
+    SvgPath = None  # type: ignore
     load_dxf = None  # type: ignore
+    iter_dxf_paths = None  # type: ignore
     load_svg = None  # type: ignore
     _HAS_PARSERS = False
 
+# Both parsers yield records of the same shape (points, closed, layer, color, source, bbox)
+CadPath = Union["DxfPath", "SvgPath"]
+
+
+# ----------------------------------------------------------------------
+# QPolygonF from NumPy
+# ----------------------------------------------------------------------
+def _probe_qpolygonf_buffer() -> bool:
+    """True if QPolygonF.data() exposes its QPointF storage as writable float64 pairs."""
+    try:
+        poly = QPolygonF()
+        poly.resize(4)  # 4 points: large enough even if qreal were float
+        ptr = poly.data()
+        ptr.setsize(2 * 16)
+        np.frombuffer(ptr, dtype=np.float64)[:] = (1.0, 2.0, 3.0, 4.0)
+        return poly[1] == QPointF(3.0, 4.0)
+    except Exception:
+        return False
+
+
+_QPOLY_SUPPORTS_BUFFER = _probe_qpolygonf_buffer()
+
+
+def _to_qpolygonf(arr) -> QPolygonF:
+    """Build a QPolygonF from an (N, 2) array without one Python QPointF per vertex."""
+    arr = np.ascontiguousarray(arr, dtype=np.float64)
+    n = len(arr)
+    poly = QPolygonF()
+    poly.resize(n)
+    if _QPOLY_SUPPORTS_BUFFER and n:
+        # memcpy straight into Qt's QList<QPointF> storage
+        ptr = poly.data()
+        ptr.setsize(n * 16)
+        np.frombuffer(ptr, dtype=np.float64).reshape(n, 2)[:] = arr
+    else:
+        for i, (x, y) in enumerate(arr.tolist()):
+            poly[i] = QPointF(x, y)
+    return poly
+
+
+def _bbox_intersects(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> bool:
+    """Axis-aligned (xmin, ymin, xmax, ymax) overlap test."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class _GridIndex:
+    """Uniform grid of buckets (cell -> path indices) over path bboxes."""
+
+    def __init__(self, bboxes: List[Tuple[float, float, float, float]], cells: int = 32) -> None:
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._cells = cells
+        self._origin = (0.0, 0.0)
+        self._size = 1.0
+        if not bboxes:
+            return
+        arr = np.asarray(bboxes, dtype=np.float64)
+        x0, y0 = float(arr[:, 0].min()), float(arr[:, 1].min())
+        extent = max(float(arr[:, 2].max()) - x0, float(arr[:, 3].max()) - y0)
+        self._origin = (x0, y0)
+        self._size = max(extent / cells, 1e-9)
+        for i, bbox in enumerate(bboxes):
+            ix0, iy0, ix1, iy1 = self._cell_span(bbox)
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    self._buckets.setdefault((ix, iy), []).append(i)
+
+    def _cell_span(self, bbox: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+        # Clamped to the populated grid so a zoomed-out view does not walk empty cells
+        x0, y0 = self._origin
+        s, n = self._size, self._cells
+        return (
+            min(max(int((bbox[0] - x0) // s), 0), n),
+            min(max(int((bbox[1] - y0) // s), 0), n),
+            min(max(int((bbox[2] - x0) // s), 0), n),
+            min(max(int((bbox[3] - y0) // s), 0), n),
+        )
+
+    def query(self, bbox: Tuple[float, float, float, float]) -> List[int]:
+        """Indices (in insertion order) of paths whose cells overlap bbox; a point is a zero-size bbox."""
+        if not self._buckets:
+            return []
+        ix0, iy0, ix1, iy1 = self._cell_span(bbox)
+        hits = set()
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                hits.update(self._buckets.get((ix, iy), ()))
+        return sorted(hits)
+
+
+# ----------------------------------------------------------------------
+# Background file loading
+# ----------------------------------------------------------------------
+class DxfLoadSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+
+class DxfLoadWorker(QRunnable):
+    """Parse a CAD file on a QThreadPool thread; results arrive via `signals`."""
+
+    PROGRESS_EVERY = 1000
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+        self.file_path = file_path
+        self.signals = DxfLoadSignals()
+
+    def _load_dxf(self) -> List[CadPath]:
+        paths: List[CadPath] = []
+        for path in iter_dxf_paths(str(self.file_path), units="mm"):
+            paths.append(path)
+            if len(paths) % self.PROGRESS_EVERY == 0:
+                self.signals.progress.emit(len(paths))
+        return paths
+
+    def run(self) -> None:
+        paths: List[CadPath] = []
+        errors: List[str] = []
+
+        suffix = self.file_path.suffix.lower()
+
+        # Load DXF files
+        if suffix == ".dxf":
+            try:
+                paths = self._load_dxf()
+            except Exception as e:
+                errors.append(f"DXF load failed: {e}")
+        # Load SVG files
+        elif suffix == ".svg":
+            try:
+                paths = load_svg(str(self.file_path)) or []
+            except Exception as e:
+                errors.append(f"SVG load failed: {e}")
+        # Unknown extension - try both
+        else:
+            try:
+                paths = self._load_dxf()
+            except Exception as e:
+                errors. append(f"DXF load failed: {e}")
+            if not paths:
+                try:
+                    paths = load_svg(str(self.file_path)) or []
+                except Exception as e:
+                    errors.append(f"SVG load failed: {e}")
+
+        if not paths:
+            msg = "Failed to load file.  No geometry found."
+            if errors:
+                msg += "\n\nDetails:\n" + "\n".join(errors)
+            self.signals.error.emit(msg)
+            return
+
+        self.signals.finished.emit(paths)
+
 
 # ----------------------------------------------------------------------
 # Canvas Widget
@@ -52,24 +211,79 @@ except Exception:
 class CanvasWidget(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
-        self.paths: List[Dict] = []
-        self.scale: float = 1.0
-        self.offset_x: float = 0.0
-        self.offset_y: float = 0.0
+        self.paths: List[CadPath] = []
+        self._polys: List[Tuple[QPolygonF, bool, Tuple[float, float, float, float]]] = []
+        self._index = _GridIndex([])
+        self._cache_pixmap: Optional[QPixmap] = None
+        self._grid_tile: Optional[QPixmap] = None
+        self._scale: float = 1.0
+        self._offset_x: float = 0.0
+        self._offset_y: float = 0.0
         self._animating: bool = False
         self._animation_phase: float = 0.0
         self._timer = QTimer(self)
         self._timer. timeout.connect(self._advance_animation)
         self. setSizePolicy(QSizePolicy. Policy.Expanding, QSizePolicy.Policy.Expanding)
 
-    def set_paths(self, paths: List[Dict]) -> None:
+        # Canvas background (GitHub dark-style) via the palette, set once;
+        # a stylesheet would go through Qt's CSS engine on every change
+        palette = self.palette()
+        palette.setColor(QPalette.ColorRole.Window, QColor("#0d1117"))
+        self.setPalette(palette)
+        self.setAutoFillBackground(True)
+
+        # Paint resources are built once instead of on every frame
+        self._grid_pen = QPen(QColor("#30363d"), 1, Qt. PenStyle.DotLine)
+        self._geom_pen = QPen(QColor("#c9d1d9"), 2)
+        self._geom_pen.setCosmetic(True)  # keep 2 px regardless of zoom
+        self._empty_pen = QPen(QColor("#8b949e"))
+        self._empty_font = QFont("Segoe UI", 16, QFont.Weight.Bold)
+        self._empty_text = QStaticText("No file loaded")
+        self._empty_text.prepare(font=self._empty_font)
+        self._torch_brush = self._make_torch_brush()
+
+    def set_paths(self, paths: List[CadPath]) -> None:
         self.paths = paths or []
+        self._polys = self._build_polys()
+        self._index = _GridIndex([bbox for _, _, bbox in self._polys])
+        self._cache_pixmap = None
         self.update()
 
     def clear(self) -> None:
         self.paths. clear()
+        self._polys = []
+        self._index = _GridIndex([])
+        self._cache_pixmap = None
+        self.update()
+
+    def _build_polys(self) -> List[Tuple[QPolygonF, bool, Tuple[float, float, float, float]]]:
+        """Build one model-space (mm) (polygon, closed, bbox) entry per path; pan/zoom is applied by the painter."""
+        polys: List[Tuple[QPolygonF, bool, Tuple[float, float, float, float]]] = []
+        for path in self.paths:
+            arr = np.asarray(path.points, dtype=np.float64)
+            if len(arr) < 2:
+                continue
+            polys.append((_to_qpolygonf(arr), path.closed, path.bbox))
+        return polys
+
+    def set_view(self, scale: float, offset_x: float, offset_y: float) -> None:
+        """Set zoom (px per mm) and pan (mm); the cached pixmap is rebuilt on the next paint."""
+        self._scale = scale
+        self._offset_x = offset_x
+        self._offset_y = offset_y
+        self._cache_pixmap = None
         self.update()
 
+    def _view_bbox(self) -> Tuple[float, float, float, float]:
+        """Visible model-space rectangle, padded by the pen width."""
+        pad = 2.0 / self._scale
+        return (
+            -self._offset_x - pad,
+            -self._offset_y - pad,
+            self.width() / self._scale - self._offset_x + pad,
+            self.height() / self._scale - self._offset_y + pad,
+        )
+
     def start_animation(self) -> None:
         if not self._animating:
             self._animating = True
@@ -88,51 +302,95 @@ class CanvasWidget(QWidget):
         self._animation_phase += 0.02
         if self._animation_phase > 1.0:
             self._animation_phase -= 1.0
-        self.update()
-
-    def paintEvent(self, event) -> None:  # type: ignore
-        p = QPainter(self)
+        # Only the torch halo changes between ticks
+        self.update(self._torch_rect())
+
+    def _torch_rect(self) -> QRect:
+        cx, cy = int(self.width() / 2), int(self.height() / 2)
+        return QRect(cx - 80, cy - 80, 160, 160).adjusted(-1, -1, 1, 1)
+
+    def _make_torch_brush(self) -> QBrush:
+        """Radial torch glow centred on the widget (depends on size only)."""
+        torch_gradient = QRadialGradient(QPointF(self.width() / 2, self.height() / 2), 80)
+        torch_gradient.setColorAt(0, QColor(0, 255, 255, 80))
+        torch_gradient.setColorAt(0.5, QColor(0, 255, 255, 40))
+        torch_gradient.setColorAt(1, QColor(0, 255, 255, 0))
+        return QBrush(torch_gradient)
+
+    def resizeEvent(self, event) -> None:  # type: ignore
+        self._cache_pixmap = None
+        self._torch_brush = self._make_torch_brush()
+        super().resizeEvent(event)
+
+    def _make_grid_tile(self, dpr: float) -> QPixmap:
+        """One 40x40 grid cell (background + top/left dotted lines) for drawTiledPixmap."""
+        step = 40
+        tile = QPixmap(int(step * dpr), int(step * dpr))
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(QColor("#0d1117"))
+        p = QPainter(tile)
+        p.setPen(self._grid_pen)
+        p.drawLine(0, 0, 0, step)
+        p.drawLine(0, 0, step, 0)
+        p.end()
+        return tile
 
-        # Canvas background (GitHub dark-style)
-        self.setStyleSheet("background-color: #0d1117;")
+    def _render_static(self) -> QPixmap:
+        """Render grid + geometry into a backing pixmap reused by every repaint."""
+        dpr = self.devicePixelRatioF()
+        pm = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        p = QPainter(pm)
 
-        # Light gray grid
-        grid_pen = QPen(QColor("#30363d"), 1, Qt. PenStyle.DotLine)
-        p.setPen(grid_pen)
-        step = 40
-        for x in range(0, self.width(), step):
-            p.drawLine(x, 0, x, self.height())
-        for y in range(0, self.height(), step):
-            p.drawLine(0, y, self.width(), y)
+        # Light gray grid, tiled from a single cell
+        if self._grid_tile is None or self._grid_tile.devicePixelRatio() != dpr:
+            self._grid_tile = self._make_grid_tile(dpr)
+        p.drawTiledPixmap(self.rect(), self._grid_tile)
 
         # Draw geometry if present
         if self.paths:
-            geom_pen = QPen(QColor("#c9d1d9"), 2)
-            for path in self.paths:
-                pts = path. get("points", [])
-                if len(pts) < 2:
+            p.setPen(self._geom_pen)
+            p.setBrush(Qt.BrushStyle.NoBrush)
+            # Model space -> screen space (Y up) folded into the painter transform
+            p.save()
+            p.translate(self._offset_x * self._scale, self.height() - self._offset_y * self._scale)
+            p.scale(self._scale, -self._scale)
+            view = self._view_bbox()
+            # The grid index narrows the candidates; the bbox test is exact
+            for i in self._index.query(view):
+                poly, closed, bbox = self._polys[i]
+                if not _bbox_intersects(bbox, view):
                     continue
-                p.setPen(geom_pen)
-                for i in range(len(pts) - 1):
-                    x1 = (pts[i][0] + self.offset_x) * self. scale
-                    y1 = self.height() - (pts[i][1] + self.offset_y) * self.scale
-                    x2 = (pts[i + 1][0] + self.offset_x) * self.scale
-                    y2 = self.height() - (pts[i + 1][1] + self.offset_y) * self.scale
-                    p. drawLine(QPointF(x1, y1), QPointF(x2, y2))
+                if closed:
+                    p.drawPolygon(poly)
+                else:
+                    p.drawPolyline(poly)
+            p.restore()
         else:
             # Placeholder text when empty
-            font = QFont("Segoe UI", 16, QFont.Weight.Bold)
-            p.setFont(font)
-            p.setPen(QPen(QColor("#8b949e")))
-            p.drawText(self.rect(), Qt.AlignmentFlag. AlignCenter, "No file loaded")
+            p.setFont(self._empty_font)
+            p.setPen(self._empty_pen)
+            size = self._empty_text.size()
+            p.drawStaticText(
+                QPointF((self.width() - size.width()) / 2, (self.height() - size.height()) / 2),
+                self._empty_text,
+            )
+
+        p.end()
+        return pm
+
+    def paintEvent(self, event) -> None:  # type: ignore
+        p = QPainter(self)
+
+        # Static content is blitted from the cache; Qt clips it to the
+        # invalidated region, so torch-only updates never re-stroke geometry
+        if self._cache_pixmap is None:
+            self._cache_pixmap = self._render_static()
+        p.drawPixmap(0, 0, self._cache_pixmap)
 
         # Torch animation placeholder
         if self._animating:
-            torch_gradient = QRadialGradient(QPointF(self.width() / 2, self.height() / 2), 80)
-            torch_gradient.setColorAt(0, QColor(0, 255, 255, 80))
-            torch_gradient.setColorAt(0.5, QColor(0, 255, 255, 40))
-            torch_gradient.setColorAt(1, QColor(0, 255, 255, 0))
-            p.setBrush(QBrush(torch_gradient))
+            p.setBrush(self._torch_brush)
             p. setPen(Qt.PenStyle.NoPen)
             p.drawEllipse(QPointF(self.width() / 2, self.height() / 2), 80, 80)
 
@@ -341,6 +599,10 @@ class MainWindow(QMainWindow):
         self.gcode_format_combo.currentIndexChanged. connect(lambda _index: None)
         self.tabs_right.currentChanged.connect(self.on_tab_changed)
 
+        # Background load state
+        self._loading_path: Optional[Path] = None
+        self._load_signals: Optional[DxfLoadSignals] = None
+
         # status bar
         self.statusBar(). showMessage("Ready")
 
@@ -375,49 +637,40 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("File not found", 4000)
             return
 
-        paths: List[Dict] = []
-        errors: List[str] = []
-
-        suffix = file_path.suffix.lower()
-
-        # Load DXF files
-        if suffix == ".dxf":
-            try:
-                paths = load_dxf(str(file_path), units="mm") or []
-            except Exception as e:
-                errors.append(f"DXF load failed: {e}")
-        # Load SVG files
-        elif suffix == ".svg":
-            try:
-                paths = load_svg(str(file_path)) or []
-            except Exception as e:
-                errors.append(f"SVG load failed: {e}")
-        # Unknown extension - try both
-        else:
-            try:
-                paths = load_dxf(str(file_path), units="mm") or []
-            except Exception as e:
-                errors. append(f"DXF load failed: {e}")
-            if not paths:
-                try:
-                    paths = load_svg(str(file_path)) or []
-                except Exception as e:
-                    errors.append(f"SVG load failed: {e}")
-
-        if not paths:
-            msg = "Failed to load file.  No geometry found."
-            if errors:
-                msg += "\n\nDetails:\n" + "\n".join(errors)
-            QMessageBox. warning(self, "Load Failed", msg)
-            self.lbl_file_status.setText("Load failed")
-            self.statusBar().showMessage("Failed to load file", 4000)
-            return
-
-        # Success
+        # Parse off the GUI thread so the window keeps repainting
+        worker = DxfLoadWorker(file_path)
+        worker.signals.progress.connect(self._on_load_progress)
+        worker.signals.finished.connect(self._on_load_finished)
+        worker.signals.error.connect(self._on_load_failed)
+        self._loading_path = file_path
+        self._load_signals = worker.signals  # keep alive until delivered
+
+        self.btn_load.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self.statusBar().showMessage(f"Loading {file_path.name}...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _end_loading(self) -> None:
+        QApplication.restoreOverrideCursor()
+        self.btn_load.setEnabled(True)
+        self._load_signals = None
+
+    def _on_load_progress(self, count: int) -> None:
+        self.statusBar().showMessage(f"Loading {self._loading_path.name}... {count} paths")
+
+    def _on_load_finished(self, paths: List[CadPath]) -> None:
+        self._end_loading()
+        file_path = self._loading_path
         self.canvas.set_paths(paths)
         self.lbl_file_status.setText(str(file_path.name))
         self.statusBar().showMessage(f"Loaded: {file_path.name} ({len(paths)} paths)", 5000)
 
+    def _on_load_failed(self, msg: str) -> None:
+        self._end_loading()
+        QMessageBox. warning(self, "Load Failed", msg)
+        self.lbl_file_status.setText("Load failed")
+        self.statusBar().showMessage("Failed to load file", 4000)
+
     # ------------------------------------------------------------------
     # Save G-code
     # ------------------------------------------------------------------
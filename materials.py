@@ -1,8 +1,14 @@
 # plasma_core/materials.py
 
 from __future__ import annotations
+import functools
 import math
-from typing import List, Dict
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Iterator, List, Dict, Tuple
+
+import numpy as np
+
 from .config import get_config
 
 
@@ -20,7 +26,12 @@ def inch_to_mm(inch: float) -> float:
 # ----------------------------------------------------------------------
 # Build comprehensive preset list (100+ entries)
 # ----------------------------------------------------------------------
-MATERIAL_PRESETS: Dict[str, Dict] = {}
+# Only the (material, thickness, amperage) rows are built at import; preset
+# values are computed on first use and stored column-wise, one array per field.
+Presets = namedtuple(
+    "Presets",
+    "material thickness_mm amperage pierce_mm cut_mm feed kerf_mm delay voltage gas consumables",
+)
 
 MATERIAL_TYPES = [
     ("Mild Steel", [1, 1.5, 2, 3, 4, 5, 6, 8, 10, 12, 16, 19, 20, 22, 25]),
@@ -30,76 +41,127 @@ MATERIAL_TYPES = [
 
 AMPERAGES = [30, 45, 60, 65, 85, 100, 125]
 
-# Generate realistic Hypertherm/Thermal values by formulas
-for material, thicknesses in MATERIAL_TYPES:
-    for tmm in thicknesses:
-        for amp in AMPERAGES:
-
-            # Generate approximations for real values
-            pierce_height_mm = 3.0 + (tmm * 0.05)
-            cut_height_mm = 1.3 + (tmm * 0.02)
-            feed_mmmin = max(300, int(5000 / (1 + (tmm / (amp / 30)))))
-            kerf_mm = max(0.9, min(2.5, 0.8 + (tmm * 0.05)))
-            pierce_delay = round(0.3 + (tmm * 0.04), 2)
-            voltage = int(110 + (tmm * 2) + (amp * 0.1))
-
-            key_name = f"{material} {tmm}mm – {amp}A"
-
-            MATERIAL_PRESETS[key_name] = {
-                "material": material,
-                "thickness_mm": float(tmm),
-                "thickness_inch": mm_to_inch(float(tmm)),
-                "amperage": int(amp),
-                "pierce_height_mm": pierce_height_mm,
-                "pierce_height_inch": mm_to_inch(pierce_height_mm),
-                "cut_height_mm": cut_height_mm,
-                "cut_height_inch": mm_to_inch(cut_height_mm),
-                "feedrate_mm_min": feed_mmmin,
-                "feedrate_ipm": feed_mmmin / 25.4,
-                "kerf_width_mm": kerf_mm,
-                "kerf_width_inch": mm_to_inch(kerf_mm),
-                "pierce_delay": pierce_delay,
-                "voltage": voltage,
-                "gas": "Air",
-                "consumables": "FineCut",
-            }
-
-
-# Add fallback custom preset
-MATERIAL_PRESETS["Custom"] = {
-    "material": "Custom",
-    "thickness_mm": 3.0,
-    "thickness_inch": mm_to_inch(3.0),
-    "amperage": 45,
-    "pierce_height_mm": 3.0,
-    "pierce_height_inch": mm_to_inch(3.0),
-    "cut_height_mm": 1.5,
-    "cut_height_inch": mm_to_inch(1.5),
-    "feedrate_mm_min": 1200,
-    "feedrate_ipm": 1200 / 25.4,
-    "kerf_width_mm": 1.2,
-    "kerf_width_inch": mm_to_inch(1.2),
-    "pierce_delay": 0.5,
-    "voltage": 120,
-    "gas": "Air",
-    "consumables": "Generic",
-}
+# Row i -> (material, thickness, amperage); "Custom" is the last row
+_ROWS: List[Tuple[str, float, int]] = [
+    (material, tmm, amp)
+    for material, thicknesses in MATERIAL_TYPES
+    for tmm in thicknesses
+    for amp in AMPERAGES
+]
+_ROWS.append(("Custom", 3.0, 45))
+_CUSTOM = len(_ROWS) - 1
+
+_KEYS: List[str] = [f"{m} {t}mm – {a}A" for m, t, a in _ROWS[:_CUSTOM]] + ["Custom"]
+_KEY_INDEX: Dict[str, int] = {k: i for i, k in enumerate(_KEYS)}
+
+
+def _make_preset(material: str, tmm: float, amp: int) -> Tuple:
+    """Values for one row in Presets field order, from the Hypertherm/Thermal approximation formulas."""
+    if material == "Custom":
+        # Fallback custom preset
+        return ("Custom", 3.0, 45, 3.0, 1.5, 1200, 1.2, 0.5, 120, "Air", "Generic")
+
+    # Generate approximations for real values
+    pierce_height_mm = 3.0 + (tmm * 0.05)
+    cut_height_mm = 1.3 + (tmm * 0.02)
+    feed_mmmin = max(300, int(5000 / (1 + (tmm / (amp / 30)))))
+    kerf_mm = max(0.9, min(2.5, 0.8 + (tmm * 0.05)))
+    pierce_delay = round(0.3 + (tmm * 0.04), 2)
+    voltage = int(110 + (tmm * 2) + (amp * 0.1))
+
+    return (material, float(tmm), int(amp), pierce_height_mm, cut_height_mm, feed_mmmin,
+            kerf_mm, pierce_delay, voltage, "Air", "FineCut")
+
+
+@functools.lru_cache(maxsize=1)
+def _build_columns() -> Presets:
+    """All presets column-wise, one array per field (built on first use)."""
+    cols = zip(*(_make_preset(*r) for r in _ROWS))
+    return Presets(*(
+        np.asarray(col, dtype=object if isinstance(col[0], str) else None) for col in cols
+    ))
+
+
+def __getattr__(name: str):
+    # PRESETS is materialized lazily, on first attribute access
+    if name == "PRESETS":
+        return _build_columns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_preset(i: int) -> Dict:
+    """Row i as a new legacy preset dict, read from the columns."""
+    p = _build_columns()
+    tmm = float(p.thickness_mm[i])
+    pierce = float(p.pierce_mm[i])
+    cut = float(p.cut_mm[i])
+    feed = int(p.feed[i])
+    kerf = float(p.kerf_mm[i])
+    return {
+        "material": p.material[i],
+        "thickness_mm": tmm,
+        "thickness_inch": mm_to_inch(tmm),
+        "amperage": int(p.amperage[i]),
+        "pierce_height_mm": pierce,
+        "pierce_height_inch": mm_to_inch(pierce),
+        "cut_height_mm": cut,
+        "cut_height_inch": mm_to_inch(cut),
+        "feedrate_mm_min": feed,
+        "feedrate_ipm": feed / 25.4,
+        "kerf_width_mm": kerf,
+        "kerf_width_inch": mm_to_inch(kerf),
+        "pierce_delay": float(p.delay[i]),
+        "voltage": int(p.voltage[i]),
+        "gas": p.gas[i],
+        "consumables": p.consumables[i],
+    }
+
+
+class _PresetTable(Mapping):
+    """Key name -> preset dict view; each lookup returns a new dict, so callers may edit it."""
+
+    def __getitem__(self, key: str) -> Dict:
+        return get_preset(_KEY_INDEX[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+
+MATERIAL_PRESETS: Mapping[str, Dict] = _PresetTable()
 
 
 # ----------------------------------------------------------------------
-# Name list for UI
+# Precomputed UI names and lookup index (built once at import)
 # ----------------------------------------------------------------------
-def get_preset_names() -> List[str]:
-    names = []
+def _format_preset_name(material: str, tmm: float, amp: int) -> str:
+    return f"{material} – {float(tmm)} mm ({mm_to_inch(float(tmm)):.3f}\") – {int(amp)} A"
+
 
-    for key, p in MATERIAL_PRESETS.items():
-        mm = p["thickness_mm"]
-        inch = p["thickness_inch"]
-        amp = p["amperage"]
-        names.append(f"{p['material']} – {mm} mm ({inch:.3f}\") – {amp} A")
+_FORMATTED: List[str] = [_format_preset_name(*r) for r in _ROWS]
 
-    names.sort()
-    return names
+# Formatted UI name or raw key name -> row; UI names win on a clash, as
+# they are what the preset combo box passes in
+_FORMATTED_INDEX: Dict[str, int] = {n: i for i, n in enumerate(_FORMATTED)}
+_NAME_INDEX: Dict[str, int] = {**_KEY_INDEX, **_FORMATTED_INDEX}
+
+# UI order: material name, then numeric thickness and amperage. Sorting on
+# small numeric tuples also keeps "10.0 mm" after "8.0 mm", which a plain
+# string sort does not.
+_MATERIAL_ORDER: Dict[str, int] = {m: i for i, m in enumerate(sorted({r[0] for r in _ROWS}))}
+_SORT_KEYS: List[Tuple[int, float, int, str]] = [
+    (_MATERIAL_ORDER[m], float(t), int(a), name) for (m, t, a), name in zip(_ROWS, _FORMATTED)
+]
+_SORTED_NAMES: List[str] = [k[3] for k in sorted(_SORT_KEYS)]
+
+
+# ----------------------------------------------------------------------
+# Name list for UI
+# ----------------------------------------------------------------------
+def get_preset_names() -> List[str]:
+    return list(_SORTED_NAMES)
 
 
 # ----------------------------------------------------------------------
@@ -108,34 +170,28 @@ def get_preset_names() -> List[str]:
 def apply_preset(name: str):
     config = get_config()
 
-    # Try matching by formatted name first
-    match = None
-    for key, p in MATERIAL_PRESETS.items():
-        mm = p["thickness_mm"]
-        inch = p["thickness_inch"]
-        amp = p["amperage"]
-        formatted = f"{p['material']} – {mm} mm ({inch:.3f}\") – {amp} A"
-        if formatted == name or key == name:
-            match = p
-            break
-
-    if match is None:
-        match = MATERIAL_PRESETS["Custom"]
+    # Formatted name or key name, falling back to the custom preset
+    i = _NAME_INDEX.get(name, _CUSTOM)
+    p = _build_columns()
+    pierce = float(p.pierce_mm[i])
+    cut = float(p.cut_mm[i])
+    feed = int(p.feed[i])
+    kerf = float(p.kerf_mm[i])
 
     if config.units == "metric":
-        config.set_param("pierce_height_mm", match["pierce_height_mm"])
-        config.set_param("cut_height_mm", match["cut_height_mm"])
-        config.set_param("cut_feed_mmmin", match["feedrate_mm_min"])
-        config.set_param("kerf_width_mm", match["kerf_width_mm"])
+        config.set_param("pierce_height_mm", pierce)
+        config.set_param("cut_height_mm", cut)
+        config.set_param("cut_feed_mmmin", feed)
+        config.set_param("kerf_width_mm", kerf)
         config.set_param("lead_in_mm", 6.0)
         config.set_param("lead_out_mm", 6.0)
     else:
-        config.set_param("pierce_height_mm", match["pierce_height_inch"])
-        config.set_param("cut_height_mm", match["cut_height_inch"])
-        config.set_param("cut_feed_mmmin", match["feedrate_ipm"])
-        config.set_param("kerf_width_mm", match["kerf_width_inch"])
-        config.set_param("lead_in_mm", match["lead_in_inch"] if "lead_in_inch" in match else mm_to_inch(6.0))
-        config.set_param("lead_out_mm", match["lead_out_inch"] if "lead_out_inch" in match else mm_to_inch(6.0))
+        config.set_param("pierce_height_mm", mm_to_inch(pierce))
+        config.set_param("cut_height_mm", mm_to_inch(cut))
+        config.set_param("cut_feed_mmmin", feed / 25.4)
+        config.set_param("kerf_width_mm", mm_to_inch(kerf))
+        config.set_param("lead_in_mm", mm_to_inch(6.0))
+        config.set_param("lead_out_mm", mm_to_inch(6.0))
 
     # Additional
     config.settings.setValue("last_applied_preset", name)
@@ -9,8 +9,16 @@ Handles multi-subpath SVG elements by splitting them.
 
 from __future__ import annotations
 
+import functools
+import math
+import os
 import re
-from typing import Optional, List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, List, Dict, Tuple
+
+import numpy as np
 
 # Attempt imports – allow failure gracefully
 try:
@@ -21,75 +29,246 @@ except Exception:
     _HAS_QT = False
 
 try:
-    from svgpathtools import parse_path, Path
+    from svgpathtools import parse_path, Path, Arc, Line, QuadraticBezier, CubicBezier
     _HAS_SVGTOOLS = True
 except ImportError:
     parse_path = None  # type: ignore
     Path = None  # type: ignore
+    Arc = Line = QuadraticBezier = CubicBezier = None  # type: ignore
     _HAS_SVGTOOLS = False
 
+try:
+    from ._svg_numba import flatten_cubics
+    _HAS_NUMBA = True
+except ImportError:
+    flatten_cubics = None  # type: ignore
+    _HAS_NUMBA = False
+
+
+@dataclass(slots=True, frozen=True)
+class SvgPath:
+    """One flattened SVG subpath; points are an (N, 2) float32 array in mm."""
+
+    points: np.ndarray
+    closed: bool
+    layer: Optional[str]
+    color: Optional[str]
+    bbox: Tuple[float, float, float, float]
+    source: str = "svg"
+
+    def __getitem__(self, key: str) -> Any:
+        """Dict-style access for callers still written against the old dict output."""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly dict (points as nested lists)."""
+        return {
+            "points": self.points.tolist(),
+            "closed": self.closed,
+            "layer": self.layer,
+            "color": self.color,
+            "source": self.source,
+            "bbox": list(self.bbox),
+        }
+
+
+# Squared distance (px^2) under which two flattened points count as the same
+_CLOSE_EPS2 = 1e-18
+
+# One number in path data (sign, decimal point and exponent optional)
+_NUM_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Below this many <path> elements the thread pool costs more than it saves
+_PARALLEL_MIN_TASKS = 64
+
 
 # ----------------------------------------------------------------------
 # Helper: Unit scale conversion
 # ----------------------------------------------------------------------
+_UNIT_SCALE: Dict[str, float] = {
+    "mm": 1.0, "millimeter": 1.0, "millimeters": 1.0,
+    "inch": 25.4, "inches": 25.4, "in": 25.4,
+    "cm": 10.0, "centimeter": 10.0, "centimeters": 10.0,
+    # 96 DPI fallback
+    "px": 25.4 / 96.0, "pixels": 25.4 / 96.0, "pixel": 25.4 / 96.0,
+}
+
+
 def _unit_scale_to_mm(unit: Optional[str]) -> float:
     """
     Convert coordinate units to millimeters. 
 
     Supported:
-      - mm, millimeter → 1. 0
+      - mm, millimeter → 1.0
       - inch, in → 25.4
       - cm → 10.0
       - px (fallback 96 DPI) → 25.4 / 96
 
     If unknown or None → default 1.0 (mm). 
     """
-    if not unit:
-        return 1. 0
-    u = unit.strip(). lower()
-    if u in ("mm", "millimeter", "millimeters"):
-        return 1. 0
-    if u in ("inch", "inches", "in"):
-        return 25.4
-    if u in ("cm", "centimeter", "centimeters"):
-        return 10.0
-    if u in ("px", "pixels", "pixel"):
-        # 96 DPI fallback
-        return 25.4 / 96. 0
-    return 1.0
+    return _UNIT_SCALE.get((unit or "").strip().lower(), 1.0)
+
+
+# SVG user units are px; the path pipeline converts with these two factors
+_PX_TO_MM = _unit_scale_to_mm("px")
+_MM_TO_PX = 1.0 / _PX_TO_MM
 
 
 # ----------------------------------------------------------------------
 # Helper: flatten Bézier/curve path
 # ----------------------------------------------------------------------
-def _flatten_path_points(path: "Path", tol_mm: float) -> List[Tuple[float, float]]:
+def _segment_points(seg, t: np.ndarray) -> np.ndarray:
+    """Evaluate one svgpathtools segment at an array of local parameters (complex result)."""
+    if Arc is not None and isinstance(seg, Arc):
+        # Arc.point() goes through math.cos/sin; same formula, vectorized
+        angle = np.radians(seg.theta + t * seg.delta)
+        cosphi, sinphi = seg.rot_matrix.real, seg.rot_matrix.imag
+        rx, ry = seg.radius.real, seg.radius.imag
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        x = rx * cosphi * cos_a - ry * sinphi * sin_a + seg.center.real
+        y = rx * sinphi * cos_a + ry * cosphi * sin_a + seg.center.imag
+        return x + 1j * y
+    # Line / QuadraticBezier / CubicBezier.point() are plain polynomials in t
+    return np.asarray(seg.point(t), dtype=np.complex128)
+
+
+def _segment_length_bound(seg) -> float:
+    """Cheap upper bound on a segment's arc length (no numerical integration)."""
+    if Arc is not None and isinstance(seg, Arc):
+        # Sweep along the larger radius
+        return max(abs(seg.radius.real), abs(seg.radius.imag)) * math.radians(abs(seg.delta))
+    # Line / Bezier: the control polygon is never shorter than the curve
+    b = seg.bpoints()
+    return sum(abs(b[i + 1] - b[i]) for i in range(len(b) - 1))
+
+
+def _arc_sample_count(seg, tol: float) -> int:
+    """Chord count that keeps the sagitta of an arc segment below tol."""
+    r = max(abs(seg.radius.real), abs(seg.radius.imag))
+    sweep = math.radians(abs(seg.delta))
+    if r <= tol:
+        return max(1, int(math.ceil(sweep / (math.pi / 6))))
+    step = 2.0 * math.acos(1.0 - tol / r)
+    return max(1, int(math.ceil(sweep / step)))
+
+
+def _cubic_ctrl(seg) -> Tuple[float, ...]:
+    """Line / QuadraticBezier / CubicBezier as one cubic control row (x0, y0, ... x3, y3)."""
+    if isinstance(seg, CubicBezier):
+        pts = (seg.start, seg.control1, seg.control2, seg.end)
+    elif isinstance(seg, QuadraticBezier):
+        # Exact degree elevation
+        c1 = seg.start + (seg.control - seg.start) * (2.0 / 3.0)
+        c2 = seg.end + (seg.control - seg.end) * (2.0 / 3.0)
+        pts = (seg.start, c1, c2, seg.end)
+    else:
+        # A line is a cubic with zero flatness: it emits just its end point
+        pts = (seg.start, seg.start, seg.end, seg.end)
+    return tuple(v for p in pts for v in (p.real, p.imag))
+
+
+def _flatten_cubics(ctrl: np.ndarray, tol: float) -> np.ndarray:
+    """Flatten a run of cubic control rows with the numba kernel."""
+    cap = 64 * len(ctrl)
+    while True:
+        out_x = np.empty(cap)
+        out_y = np.empty(cap)
+        n = flatten_cubics(ctrl, tol, out_x, out_y)
+        if n >= 0:
+            return np.column_stack((out_x[:n], out_y[:n]))
+        # Grow the buffers and redo the run
+        cap *= 2
+
+
+def _flatten_path_adaptive(path: "Path", tol: float) -> np.ndarray:
     """
-    Flatten an SVG path to polyline points using adaptive sampling.
+    Flatten an SVG path with curvature-adaptive sampling (numba kernel).
 
-    - tol_mm is max chordal error in mm. 
-    - Ensures a minimum of 64 samples per segment.
+    Curves are subdivided until they are within tol of their chords, so
+    straight-ish segments get few points. Consecutive line/Bezier segments
+    go to the kernel as one batch; arcs are sampled by chord count.
     """
-    pts: List[Tuple[float, float]] = []
-    if not _HAS_SVGTOOLS or path is None:
-        return []
+    p0 = path[0].start
+    pieces = [np.array([[p0.real, p0.imag]])]
+    run: List[Tuple[float, ...]] = []
+    for seg in path:
+        if isinstance(seg, (Line, QuadraticBezier, CubicBezier)):
+            run.append(_cubic_ctrl(seg))
+            continue
+        if run:
+            pieces.append(_flatten_cubics(np.array(run), tol))
+            run = []
+        # Arc or anything else: fixed chordal count, vectorized evaluation
+        k = _arc_sample_count(seg, tol) if isinstance(seg, Arc) else 64
+        pts = _segment_points(seg, np.arange(1, k + 1) / k)
+        pieces.append(np.column_stack((pts.real, pts.imag)))
+    if run:
+        pieces.append(_flatten_cubics(np.array(run), tol))
+    return np.concatenate(pieces)
+
+
+def _flatten_path_points(path: "Path", tol_mm: float) -> np.ndarray:
+    """
+    Flatten an SVG path to an (N, 2) float64 array of polyline points.
+
+    - tol_mm is max chordal error in mm.
+    - With numba, curves are subdivided adaptively (_flatten_path_adaptive).
+    - Otherwise samples are spread over segments in proportion to their
+      length bounds, at least 64 per path, each segment evaluated in one
+      vectorized call.
+    """
+    if not _HAS_SVGTOOLS or path is None or len(path) == 0:
+        return np.empty((0, 2))
 
-    # Determine safe length
+    if _HAS_NUMBA:
+        # Path coordinates are px; the tolerance is in mm
+        try:
+            return _flatten_path_adaptive(path, tol_mm * _MM_TO_PX)
+        except Exception:
+            pass
+
+    # Per-segment length bounds; over-estimating only adds samples
     try:
-        length = max(path.length(error=1e-4), 1e-3)
+        lengths = [_segment_length_bound(seg) for seg in path]
+        total = sum(lengths)
     except Exception:
-        length = 1. 0
+        lengths, total = [], 0.0
+    length = max(total, 1e-3)
 
     # Estimate number of segments
-    segs = max(64, int((length * 1. 0) / max(tol_mm, 1e-3)))
-
-    for i in range(segs + 1):
-        t = i / segs
+    segs = max(64, int((length * 1.0) / max(tol_mm, 1e-3)))
+    ts = np.linspace(0.0, 1.0, segs + 1)
+
+    # Map each global T onto (segment index, local t)
+    if total > 0:
+        ends = np.cumsum([l / total for l in lengths])
+    else:
+        ends = np.linspace(0.0, 1.0, len(path) + 1)[1:]
+    starts = np.concatenate(([0.0], ends[:-1]))
+    idx = np.minimum(np.searchsorted(ends, ts, side="left"), len(path) - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        local = (ts - starts[idx]) / (ends[idx] - starts[idx])
+    local[0], idx[0] = 0.0, 0
+    local[-1], idx[-1] = 1.0, len(path) - 1
+
+    out = np.empty(len(ts), dtype=np.complex128)
+    keep = np.isfinite(local)
+    for i, seg in enumerate(path):
+        mask = keep & (idx == i)
+        if not mask.any():
+            continue
         try:
-            p = path.point(t)
+            out[mask] = _segment_points(seg, local[mask])
         except Exception:
-            continue
-        pts.append((float(p.real), float(p.imag)))
+            keep &= ~mask
 
+    out = out[keep]
+    pts = np.empty((len(out), 2))
+    pts[:, 0] = out.real
+    pts[:, 1] = out.imag
     return pts
 
 
@@ -103,132 +282,185 @@ def _split_path_by_moves(d_string: str) -> List[str]:
     """
     if not d_string:
         return []
-    
-    # Split by M or m commands (case-insensitive move commands)
-    # Keep the M/m in the result
-    parts = re.split(r'(? =[Mm])', d_string. strip())
-    
+
+    # Split in front of every M or m, keeping the command with its subpath.
+    # NUL cannot occur in XML attribute values, so it is a safe separator.
+    parts = d_string.strip().replace("M", "\0M").replace("m", "\0m").split("\0")
+
     # Filter out empty strings
-    subpaths = [p. strip() for p in parts if p.strip()]
-    
-    return subpaths
+    return [p.strip() for p in parts if p.strip()]
 
 
 # ----------------------------------------------------------------------
-# Main SVG loader – ONE ENTRY PER SVG ELEMENT, never merged
+# Helper: legacy point format
 # ----------------------------------------------------------------------
-def load_svg(filepath: str) -> List[Dict]:
-    """
-    Load an SVG file and return a list of path dicts, one per SVG element. 
+def to_tuple_list(points) -> List[Tuple[float, float]]:
+    """Convert an (N, 2) points array back to [(x, y), ...] for older consumers."""
+    return [(float(x), float(y)) for x, y in np.asarray(points).tolist()]
 
-    Exact output format per shape:
-      {
-        "points": [(x,y), ... ],  # in mm
-        "closed": bool,
-        "layer": str|None,
-        "color": str|None,
-        "source": "svg"
-      }
-    """
-    if not _HAS_SVGTOOLS or parse_path is None:
-        return []
 
-    result: List[Dict] = []
+# ----------------------------------------------------------------------
+# Helper: current UI units
+# ----------------------------------------------------------------------
+def _current_units() -> str:
+    """
+    Units setting from QSettings.
 
-    # Parse the SVG file manually to extract path elements
+    Read on every load_svg call (a cheap lookup) so a units switch takes
+    effect on the next load; the resulting tolerance is part of the
+    _load_svg_cached key.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            svg_content = f.read()
+        if _HAS_QT and QSettings is not None:
+            s = QSettings("FireBridgeCAM", "FireBridgeCAM Pro")
+            return str(s.value("units", "metric") or "metric")
     except Exception:
-        return []
+        pass
+    return "metric"
 
-    # Extract all <path> elements with regex
-    path_pattern = re.compile(r'<path\s+([^>]+)/? >', re.IGNORECASE)
-    path_matches = path_pattern.findall(svg_content)
 
-    current_units = None
+# ----------------------------------------------------------------------
+# Helper: stream <path> attributes
+# ----------------------------------------------------------------------
+def _iter_path_attrs(filepath: str) -> Iterator[Dict[str, str]]:
+    """
+    Yield the attribute dict of every <path> element, in document order.
+
+    Streams the file through the C XML parser instead of regex-scanning the
+    whole text; each element is cleared as soon as its attributes are taken.
+    """
     try:
-        if _HAS_QT and QSettings is not None:
-            s = QSettings("FireBridgeCAM", "FireBridgeCAM Pro")
-            current_units = s.value("units", "metric")
-    except Exception:
-        current_units = "metric"
+        for _event, elem in ET.iterparse(filepath, events=("end",)):
+            if elem.tag == "path" or elem.tag.endswith("}path"):
+                attrs = dict(elem.attrib)
+                elem.clear()
+                yield attrs
+    except (ET.ParseError, OSError):
+        return
 
-    tol_mm = 0.05 if str(current_units or "metric"). startswith("met") else 0.002
 
-    for path_attrs_str in path_matches:
-        # Parse attributes
-        attrs = {}
-        attr_pattern = re.compile(r'(\w+)\s*=\s*"([^"]*)"')
-        for match in attr_pattern.finditer(path_attrs_str):
-            attrs[match.group(1)] = match.group(2)
+# ----------------------------------------------------------------------
+# Helper: one subpath -> one SvgPath
+# ----------------------------------------------------------------------
+def _process_subpath(sub: "Path", attrs: Dict[str, str], tol_mm: float) -> Optional[SvgPath]:
+    """Flatten and close one subpath; None if it yields no usable geometry."""
+    if len(sub) == 0:
+        return None
+
+    # Flatten the path object
+    pts = _flatten_path_points(sub, tol_mm)
+    if len(pts) < 2:
+        return None
+
+    # A Z command always ends on the subpath start, so closure is just
+    # whether the subpath comes back to where it began
+    closed = sub.start == sub.end
+
+    # Closure lives in the flag alone: a closing point that repeats the start
+    # is dropped and the renderer closes the outline itself
+    if closed:
+        dx = pts[0, 0] - pts[-1, 0]
+        dy = pts[0, 1] - pts[-1, 1]
+        if dx * dx + dy * dy <= _CLOSE_EPS2:
+            pts = pts[:-1]
+            if len(pts) < 2:
+                return None
+
+    # Scale to mm and cast to float32 in a single write
+    arr = np.empty(pts.shape, dtype=np.float32)
+    np.multiply(pts, _PX_TO_MM, out=arr, casting="same_kind")
+    # Shared through the load_svg cache
+    arr.flags.writeable = False
+    (xmin, ymin), (xmax, ymax) = arr.min(axis=0), arr.max(axis=0)
+
+    # Extract color (from stroke attribute)
+    color: Optional[str] = attrs.get("stroke")
+    if color in ("none", "", None):
+        color = None
+
+    # Each subpath becomes one separate path; layer comes from the id attribute
+    return SvgPath(
+        points=arr,
+        closed=closed,
+        layer=attrs.get("id"),
+        color=color,
+        bbox=(float(xmin), float(ymin), float(xmax), float(ymax)),
+    )
+
+
+def _process_element(task: Tuple[Dict[str, str], float]) -> List[SvgPath]:
+    """
+    Return an SvgPath per subpath of one <path> element.
 
-        d_attr = attrs.get('d', '')
-        if not d_attr:
+    Subpaths are split on move commands, so contours that merely touch stay
+    separate. Each piece is parsed once, starting from the pen position the
+    previous piece left, so a relative 'm' resolves as in the full path.
+    """
+    attrs, tol_mm = task
+    out: List[SvgPath] = []
+    pos = 0j
+    for subpath_str in _split_path_by_moves(attrs["d"]):
+        try:
+            sub = parse_path(subpath_str, current_pos=pos)
+            if len(sub):
+                # After a Z this is the subpath start, as SVG specifies
+                pos = sub.end
+            else:
+                # Bare moveto: no segments, so read the target straight off it
+                x, y = (float(v) for v in _NUM_RE.findall(subpath_str)[:2])
+                pos = complex(x, y) if subpath_str[0] == "M" else pos + complex(x, y)
+        except Exception:
             continue
+        entry = _process_subpath(sub, attrs, tol_mm)
+        if entry is not None:
+            out.append(entry)
+    return out
 
-        # Split the path by Move commands to get separate subpaths
-        subpath_strings = _split_path_by_moves(d_attr)
 
-        for subpath_str in subpath_strings:
-            if not subpath_str. strip():
-                continue
+# ----------------------------------------------------------------------
+# Main SVG loader – ONE ENTRY PER SVG ELEMENT, never merged
+# ----------------------------------------------------------------------
+def load_svg(filepath: str) -> List[SvgPath]:
+    """
+    Load an SVG file and return a list of SvgPath records, one per subpath
+    of each SVG element.
+
+    Fields per shape (also readable as path["points"] etc.):
+        points: ndarray (N, 2) float32, in mm (read-only)
+        closed: bool
+        layer:  str|None
+        color:  str|None
+        source: "svg"
+
+    Results are cached per (file, mtime, size, tolerance); an unchanged file
+    is not parsed again.
+    """
+    if not _HAS_SVGTOOLS or parse_path is None:
+        return []
+
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return []
 
-            try:
-                path_obj = parse_path(subpath_str)
-            except Exception:
-                continue
+    tol_mm = 0.05 if _current_units().startswith("met") else 0.002
+    return list(_load_svg_cached(str(filepath), st.st_mtime_ns, st.st_size, tol_mm))
 
-            if path_obj is None or len(path_obj) == 0:
-                continue
 
-            # Flatten the path object
-            pts = _flatten_path_points(path_obj, tol_mm)
-            if len(pts) < 2:
-                continue
+@functools.lru_cache(maxsize=32)
+def _load_svg_cached(filepath: str, mtime_ns: int, size: int, tol_mm: float) -> Tuple[SvgPath, ...]:
+    """Parse and flatten one file; mtime_ns and size only key the cache."""
+    # Every <path> element is an independent job
+    tasks = [(attrs, tol_mm) for attrs in _iter_path_attrs(filepath) if attrs.get("d")]
 
-            # Determine if path is closed
-            closed = False
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(tasks) < _PARALLEL_MIN_TASKS:
+        processed = map(_process_element, tasks)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            processed = list(ex.map(_process_element, tasks))
 
-            # Check 1: subpath ends with 'Z' or 'z'
-            if subpath_str.strip().upper().endswith("Z"):
-                closed = True
-            else:
-                # Check 2: Use svgpathtools isclosed() method
-                try:
-                    closed = path_obj.isclosed()
-                except Exception:
-                    # Check 3: Fallback - first point equals last point
-                    if len(pts) >= 2:
-                        dx = abs(pts[0][0] - pts[-1][0])
-                        dy = abs(pts[0][1] - pts[-1][1])
-                        closed = (dx < 1e-6 and dy < 1e-6)
-
-            # Ensure closed paths have matching first and last points
-            if closed and len(pts) >= 2 and pts[0] != pts[-1]:
-                pts.append(pts[0])
-
-            # Convert to mm coordinates
-            mm_pts = [(x * _unit_scale_to_mm("px"), y * _unit_scale_to_mm("px")) for x, y in pts]
-
-            # Extract layer (from id attribute)
-            layer: Optional[str] = attrs.get("id")
-
-            # Extract color (from stroke attribute)
-            color: Optional[str] = attrs.get("stroke")
-            if color in ("none", "", None):
-                color = None
-
-            # Each subpath becomes one separate path
-            result.append({
-                "points": mm_pts,
-                "closed": closed,
-                "layer": layer,
-                "color": color,
-                "source": "svg"
-            })
-
-    return result
+    return tuple(entry for entries in processed for entry in entries)
 
 
 if __name__ == "__main__":